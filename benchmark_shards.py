@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Shard Fan-out Benchmark
+Measures query latency of sharded_search as the number of shards grows,
+comparing a sequential scan of the shards with the threaded fan-out.
+Uses an in-memory Chroma client and random unit vectors, so no OpenAI
+calls are made.
+"""
+
+import math
+import random
+import statistics
+import time
+
+import chromadb
+
+from sharded_search import DEFAULT_EMBEDDING_MODEL, query_shards
+
+DIMENSIONS = 1536  # text-embedding-3-small
+CHUNKS_PER_SHARD = 2000
+SHARD_COUNTS = [1, 2, 4, 8, 16]
+QUERIES = 20
+TOP_K = 5
+
+
+def random_unit_vector(rng: random.Random) -> list[float]:
+    vector = [rng.gauss(0, 1) for _ in range(DIMENSIONS)]
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector]
+
+
+def build_shards(client, shard_count: int, rng: random.Random) -> list[dict]:
+    """
+    Create `shard_count` collections, one per synthetic year.
+    """
+    shards = []
+    for i in range(shard_count):
+        name = f"bench_{shard_count}_{i}"
+        collection = client.get_or_create_collection(name=name)
+        collection.add(
+            ids=[f"{name}_{j}" for j in range(CHUNKS_PER_SHARD)],
+            documents=[f"chunk {j} of shard {i}" for j in range(CHUNKS_PER_SHARD)],
+            embeddings=[random_unit_vector(rng) for _ in range(CHUNKS_PER_SHARD)],
+            metadatas=[{"chunk_index": j} for j in range(CHUNKS_PER_SHARD)]
+        )
+        shards.append({
+            "name": name,
+            "metadata": {"year": 2020 + i},
+            "embedding_model": DEFAULT_EMBEDDING_MODEL,
+        })
+    return shards
+
+
+def time_queries(run, queries: list[list[float]]) -> float:
+    """
+    Return the median latency of `run` over the queries, in milliseconds.
+    """
+    run(queries[0])  # warm up the HNSW indexes
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        run(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark():
+    rng = random.Random(42)
+    client = chromadb.EphemeralClient()
+    queries = [random_unit_vector(rng) for _ in range(QUERIES)]
+
+    print(f"{CHUNKS_PER_SHARD} chunks per shard, top_k={TOP_K}, median of {QUERIES} queries\n")
+    print(f"{'shards':>6} {'sequential ms':>14} {'parallel ms':>12} {'routed (1 shard) ms':>20}")
+
+    for shard_count in SHARD_COUNTS:
+        shards = build_shards(client, shard_count, rng)
+
+        def sequential(query):
+            return query_shards({DEFAULT_EMBEDDING_MODEL: query}, TOP_K,
+                                shards=shards, parallel=False, client=client)
+
+        def parallel(query):
+            return query_shards({DEFAULT_EMBEDDING_MODEL: query}, TOP_K,
+                                shards=shards, parallel=True, client=client)
+
+        def routed(query):
+            return query_shards({DEFAULT_EMBEDDING_MODEL: query}, TOP_K,
+                                where={"year": 2020}, shards=shards, client=client)
+
+        print(f"{shard_count:>6} {time_queries(sequential, queries):>14.2f} "
+              f"{time_queries(parallel, queries):>12.2f} {time_queries(routed, queries):>20.2f}")
+
+        for shard in shards:
+            client.delete_collection(name=shard["name"])
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Token-aware Chunker for RAG Pipeline
+Splits transcripts on sentence and word boundaries so every chunk stays
+within a token budget for the embedding model. Token counts come from a
+local tokenizer and are cached per word and per transcript, so the whole
+corpus can be re-chunked in well under a second.
+"""
+
+import logging
+import re
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_ENCODING = "cl100k_base"  # used by text-embedding-3-small
+# About the character chunker's 500/100 budget under the regex estimate
+# (~4.7 chars per token on these transcripts); see compare_chunkers.py
+CHUNK_TOKENS = 125
+OVERLAP_TOKENS = 25
+
+# Character chunker defaults, kept for comparison with the token chunker
+CHUNK_SIZE = 500
+OVERLAP = 100
+
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*$')
+# Rough stand-in for the tokenizer's pre-split when tiktoken is unavailable
+TOKEN_PIECE = re.compile(r"'(?:s|t|re|ve|m|ll|d)|[^\W\d_]+|\d{1,3}|[^\s\w]+", re.IGNORECASE)
+
+_encoding = None
+_encoding_loaded = False
+_word_tokens = {}
+_head_tokens = {}
+
+
+def get_encoding():
+    """
+    Load the tiktoken encoding once. Returns None if tiktoken is not
+    installed or its encoding file cannot be loaded (it is downloaded on
+    first use), in which case token counts are estimated.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(EMBEDDING_ENCODING)
+        except (ImportError, OSError, ValueError) as e:
+            logger.warning("tiktoken %s unavailable (%s); token counts are estimated",
+                           EMBEDDING_ENCODING, e)
+            _encoding = None
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate a token count without a tokenizer: common words are a single
+    token and long words are split roughly every eight characters.
+    """
+    return sum(
+        1 + (len(piece) - 1) // 8 if piece.isalpha() else 1
+        for piece in TOKEN_PIECE.findall(text)
+    )
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens the embedding model will see for `text`.
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode_ordinary(text))
+
+
+def word_tokens(word: str) -> int:
+    """
+    Token count of a word as it appears mid-text (with its leading space).
+    Cached, since transcripts reuse a small vocabulary.
+    """
+    tokens = _word_tokens.get(word)
+    if tokens is None:
+        tokens = count_tokens(' ' + word)
+        _word_tokens[word] = tokens
+    return tokens
+
+
+def head_tokens(word: str) -> int:
+    """
+    Token count of a word at the start of a chunk (no leading space), which
+    can differ from its mid-text count. Cached like word_tokens.
+    """
+    tokens = _head_tokens.get(word)
+    if tokens is None:
+        tokens = count_tokens(word)
+        _head_tokens[word] = tokens
+    return tokens
+
+
+def split_word(word: str, max_tokens: int) -> list[str]:
+    """
+    Split a word longer than the token budget into the longest character
+    pieces that each fit within it.
+    """
+    pieces = []
+    while word:
+        low, high = 1, len(word)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if count_tokens(word[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        pieces.append(word[:low])
+        word = word[low:]
+    return pieces
+
+
+@lru_cache(maxsize=256)
+def split_transcript(transcript: str) -> tuple[tuple[str, ...], tuple[int, ...],
+                                              tuple[int, ...], tuple[bool, ...]]:
+    """
+    Split a transcript into words, token counts and sentence ends.
+
+    `prefix[i]` is the number of tokens in the first i words counted mid-text,
+    and `heads[i]` is the count of word i when it starts a chunk, so any span
+    of words can be measured in constant time. `sentence_ends[i]` is True
+    when word i closes a sentence.
+    """
+    words = tuple(transcript.split())
+
+    prefix = [0]
+    for word in words:
+        prefix.append(prefix[-1] + word_tokens(word))
+
+    heads = tuple(head_tokens(word) for word in words)
+    sentence_ends = tuple(bool(SENTENCE_END.search(word)) for word in words)
+    return words, tuple(prefix), heads, sentence_ends
+
+
+def create_token_chunks(transcript: str, max_tokens: int = CHUNK_TOKENS,
+                        overlap_tokens: int = OVERLAP_TOKENS) -> list[str]:
+    """
+    Chunk a transcript into pieces of at most `max_tokens` tokens.
+
+    Chunks never cut a word in half and prefer to end on a sentence boundary
+    when one falls in the back half of the chunk. The only exception is a
+    single word longer than the budget, which is split into pieces that fit.
+
+    The overlap is adaptive: it carries over up to `overlap_tokens` tokens,
+    snapped forward to the first sentence start in that window so the next
+    chunk begins on a whole sentence when it can. Auto-generated captions
+    are mostly unpunctuated, in which case chunking falls back to word
+    boundaries. Raises ValueError unless 0 <= overlap_tokens < max_tokens.
+    """
+    if max_tokens < 1:
+        raise ValueError(f"max_tokens must be positive, got {max_tokens}")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError(f"overlap_tokens must be in [0, {max_tokens}), got {overlap_tokens}")
+
+    words, prefix, heads, sentence_ends = split_transcript(transcript)
+
+    def span_tokens(first: int, end: int) -> int:
+        # Tokens in ' '.join(words[first:end]); the first word has no leading space
+        return heads[first] + prefix[end] - prefix[first + 1]
+
+    chunks = []
+    start = 0
+
+    while start < len(words):
+        if heads[start] > max_tokens:
+            # Oversized word: split it up, with no overlap into the next chunk
+            chunks.extend(split_word(words[start], max_tokens))
+            start += 1
+            continue
+
+        # Grow the chunk as far as the token budget allows
+        end = start + 1
+        while end < len(words) and span_tokens(start, end + 1) <= max_tokens:
+            end += 1
+
+        # Pull the end back to a sentence boundary if one is close enough
+        if end < len(words):
+            for i in range(end, start, -1):
+                if span_tokens(start, i) < max_tokens // 2:
+                    break
+                if sentence_ends[i - 1]:
+                    end = i
+                    break
+
+        chunks.append(' '.join(words[start:end]))
+        if end >= len(words):
+            break
+
+        # Step back into the chunk for the overlap, never past its first word
+        next_start = end
+        while next_start > start + 1 and span_tokens(next_start - 1, end) <= overlap_tokens:
+            next_start -= 1
+
+        for i in range(next_start, end + 1):
+            if sentence_ends[i - 1]:
+                next_start = i
+                break
+
+        start = next_start
+
+    return chunks
+
+
+def create_chunks(transcript: str, chunks_size: int = CHUNK_SIZE, overlap: int = OVERLAP) -> list[str]:
+    """
+    Original fixed-width character chunker.
+    """
+    chunks = []
+    start = 0
+
+    while start < len(transcript):
+        end = start + chunks_size
+        chunk = transcript[start:end]
+        chunks.append(chunk)
+
+        start = end - overlap
+
+    return chunks
@@ -6,6 +6,7 @@ import uuid
 from openai import OpenAI
 from pathlib import Path
 from dotenv import load_dotenv
+from chunker import create_token_chunks, CHUNK_TOKENS, OVERLAP_TOKENS
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
@@ -27,7 +28,9 @@ def process_all_transcripts():
         with open(file, 'r') as f:
             data = json.load(f)
         
-        transcript = data['transcript'][500:]
+        # Skip the intro, advancing to the next word boundary after it
+        cut = data['transcript'].find(' ', 500)
+        transcript = data['transcript'][cut + 1:] if cut != -1 else ''
         title = data.get('video_title', file.stem)
 
         all_transcripts.append({
@@ -40,26 +43,10 @@ def process_all_transcripts():
 
 # Now, chunk the transcripts
 
-CHUNK_SIZE = 500
-OVERLAP = 100
-
-def create_chunks(transcript, chunks_size, overlap):
-    chunks = []
-    start = 0
-
-    while start < len(transcript):
-        end = start + chunks_size
-        chunk = transcript[start:end]
-        chunks.append(chunk)
-
-        start = end - overlap
-    
-    return chunks
-
 def chunk_all_transcripts(all_transcripts):
     all_chunks = []
     for i, video in enumerate(all_transcripts):
-        chunks = create_chunks(video['transcript'], CHUNK_SIZE, OVERLAP)
+        chunks = create_token_chunks(video['transcript'], CHUNK_TOKENS, OVERLAP_TOKENS)
         
         all_chunks.append({
             'title': video['title'],
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Chunker Comparison
+Compares the original character chunker with the token-aware chunker on the
+processed transcripts: chunk counts, token sizes, words cut in half, timing
+and a retrieval check.
+
+Retrieval is measured with BM25 over the chunks so it runs offline. Each
+query is a short phrase sampled from a transcript; a hit means the top chunk
+comes from the right video, and an intact hit means that chunk also contains
+the whole phrase, i.e. the chunker did not split the passage being asked about.
+"""
+
+import json
+import math
+import random
+import time
+from collections import Counter
+from pathlib import Path
+
+from chunker import (CHUNK_SIZE, CHUNK_TOKENS, EMBEDDING_ENCODING, OVERLAP,
+                     OVERLAP_TOKENS, count_tokens, create_chunks,
+                     create_token_chunks, get_encoding, split_transcript)
+
+PROCESSED_DIR = "processed"
+QUERIES_PER_VIDEO = 5
+QUERY_WORDS = 12
+
+
+def load_transcripts(processed_dir: str = PROCESSED_DIR) -> list[dict]:
+    transcripts = []
+    for file in sorted(Path(processed_dir).glob("*.json")):
+        with open(file, 'r') as f:
+            data = json.load(f)
+        transcripts.append({'video_id': file.stem, 'transcript': data['transcript']})
+    return transcripts
+
+
+def chunk_corpus(transcripts: list[dict], chunk_fn) -> tuple[list[tuple[str, str]], float]:
+    """
+    Chunk every transcript, returning (video_id, chunk) pairs and the seconds taken.
+    """
+    start = time.perf_counter()
+    chunks = [
+        (video['video_id'], chunk)
+        for video in transcripts
+        for chunk in chunk_fn(video['transcript'])
+    ]
+    return chunks, time.perf_counter() - start
+
+
+def count_split_words(transcripts: list[dict], chunks: list[tuple[str, str]]) -> int:
+    """
+    Count chunks whose first or last word is not a whole word of the transcript.
+    """
+    vocabulary = {word for video in transcripts for word in video['transcript'].split()}
+    split = 0
+    for _, chunk in chunks:
+        words = chunk.split()
+        if words and (words[0] not in vocabulary or words[-1] not in vocabulary):
+            split += 1
+    return split
+
+
+class BM25:
+    def __init__(self, documents: list[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        term_counts = [Counter(doc.lower().split()) for doc in documents]
+        self.lengths = [sum(counts.values()) for counts in term_counts]
+        self.avg_length = sum(self.lengths) / len(self.lengths)
+
+        # Inverted index: term -> [(document index, term frequency)]
+        self.postings = {}
+        for i, counts in enumerate(term_counts):
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((i, tf))
+
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def top(self, query: str) -> int:
+        scores = Counter()
+        for term in query.lower().split():
+            for i, tf in self.postings.get(term, []):
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[i] / self.avg_length)
+                scores[i] += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+        return scores.most_common(1)[0][0] if scores else 0
+
+
+def sample_queries(transcripts: list[dict]) -> list[tuple[str, str]]:
+    rng = random.Random(42)
+    queries = []
+    for video in transcripts:
+        words = video['transcript'].split()
+        if len(words) < QUERY_WORDS:
+            continue
+        for _ in range(QUERIES_PER_VIDEO):
+            start = rng.randrange(len(words) - QUERY_WORDS + 1)
+            queries.append((video['video_id'], ' '.join(words[start:start + QUERY_WORDS])))
+    return queries
+
+
+def evaluate_retrieval(chunks: list[tuple[str, str]], queries: list[tuple[str, str]]) -> tuple[float, float]:
+    index = BM25([chunk for _, chunk in chunks])
+    hits = intact = 0
+    for video_id, query in queries:
+        top_video, top_chunk = chunks[index.top(query)]
+        if top_video == video_id:
+            hits += 1
+            if query in top_chunk:
+                intact += 1
+    return hits / len(queries), intact / len(queries)
+
+
+def compare():
+    transcripts = load_transcripts()
+    queries = sample_queries(transcripts)
+    tokenizer = f"tiktoken {EMBEDDING_ENCODING}" if get_encoding() else "estimated"
+
+    print(f"{len(transcripts)} transcripts, {len(queries)} queries, token counts: {tokenizer}\n")
+
+    # Cold run includes filling the per-word and per-transcript caches
+    split_transcript.cache_clear()
+    _, cold_seconds = chunk_corpus(transcripts, create_token_chunks)
+
+    chunkers = [
+        (f"chars {CHUNK_SIZE}/{OVERLAP}", lambda t: create_chunks(t, CHUNK_SIZE, OVERLAP)),
+        (f"tokens {CHUNK_TOKENS}/{OVERLAP_TOKENS}", create_token_chunks),
+        # Larger chunks cut the count further but lose retrieval quality here
+        ("tokens 256/32", lambda t: create_token_chunks(t, 256, 32)),
+    ]
+
+    print(f"{'chunker':<16} {'chunks':>7} {'avg tok':>8} {'max tok':>8} {'split words':>12} "
+          f"{'ms':>7} {'hit@1':>6} {'intact':>7}")
+    for name, chunk_fn in chunkers:
+        chunks, seconds = chunk_corpus(transcripts, chunk_fn)
+        tokens = [count_tokens(chunk) for _, chunk in chunks]
+        hit_rate, intact_rate = evaluate_retrieval(chunks, queries)
+        print(f"{name:<16} {len(chunks):>7} {sum(tokens) / len(tokens):>8.1f} {max(tokens):>8} "
+              f"{count_split_words(transcripts, chunks):>12} {seconds * 1000:>7.1f} "
+              f"{hit_rate:>6.1%} {intact_rate:>7.1%}")
+
+    print(f"\nToken chunker, cold caches: {cold_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    compare()
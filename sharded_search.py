@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Sharded Retrieval for RAG Pipeline
+Spreads transcript chunks over several ChromaDB collections (shards), e.g. per
+channel, per year or per embedding version. A query is routed to the shards
+whose metadata can match its filter, fanned out to them concurrently, and the
+per-shard hits are normalized, deduplicated and merged into a single top-k list.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import chromadb
+from chromadb.errors import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+CHROMA_PATH = "./chroma_db"
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+DEFAULT_CHANNEL = "TheBlackFemaleEngineer"
+FAN_OUT_WORKERS = 8
+
+COMPARISON_OPERATORS = {"$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte"}
+
+# Shard registry. `metadata` describes what every chunk in the shard has in
+# common; it is used for routing and is never sent to Chroma as a filter.
+SHARDS = [
+    {
+        "name": "youtube_transcripts",
+        "metadata": {"channel": DEFAULT_CHANNEL, "embedding_version": "chroma"},
+        "embedding_model": DEFAULT_EMBEDDING_MODEL,
+    },
+    {
+        "name": "youtube_transcripts_v1",
+        "metadata": {"channel": DEFAULT_CHANNEL, "embedding_version": "v1"},
+        "embedding_model": DEFAULT_EMBEDDING_MODEL,
+        "source_file": "embedded_chunks",
+    },
+    {
+        "name": "youtube_transcripts_v2",
+        "metadata": {"channel": DEFAULT_CHANNEL, "embedding_version": "v2"},
+        "embedding_model": DEFAULT_EMBEDDING_MODEL,
+        "source_file": "embedded_chunks2",
+    },
+    {
+        "name": "youtube_transcripts_v3",
+        "metadata": {"channel": DEFAULT_CHANNEL, "embedding_version": "v3"},
+        "embedding_model": DEFAULT_EMBEDDING_MODEL,
+        "source_file": "embedded_chunks3",
+    },
+]
+
+_chroma_client = None
+_openai_client = None
+_executor = None
+
+
+def get_chroma_client():
+    """
+    Lazily open the persistent Chroma client shared by all shards.
+    """
+    global _chroma_client
+    if _chroma_client is None:
+        _chroma_client = chromadb.PersistentClient(path=CHROMA_PATH)
+    return _chroma_client
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Lazily create the thread pool reused by every fan-out.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=FAN_OUT_WORKERS)
+    return _executor
+
+
+def is_remote(client) -> bool:
+    """
+    True for an HTTP client talking to a Chroma server. In-process clients
+    serialize queries internally, so fanning out to them on threads only
+    adds overhead.
+    """
+    return client.get_settings().chroma_api_impl.endswith("FastAPI")
+
+
+def embed_query(query: str, model: str = DEFAULT_EMBEDDING_MODEL) -> list[float]:
+    """
+    Embed a query with the given OpenAI embedding model.
+    """
+    global _openai_client
+    if _openai_client is None:
+        from dotenv import load_dotenv
+        from openai import OpenAI
+
+        load_dotenv()
+        _openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+
+    response = _openai_client.embeddings.create(model=model, input=query)
+    return response.data[0].embedding
+
+
+def load_embedded_chunks(shard: dict, client=None) -> int:
+    """
+    Load one of the `embedded_chunks*` JSON files into its shard collection.
+    Returns the number of chunks stored.
+    """
+    client = client or get_chroma_client()
+    collection = client.get_or_create_collection(
+        name=shard["name"],
+        metadata={"description": "The Black Female Engineer YouTube Content", **shard["metadata"]}
+    )
+
+    with open(shard["source_file"], 'r') as f:
+        embedded_chunks = json.load(f)
+
+    collection.upsert(
+        ids=[str(chunk["chunk_id"]) for chunk in embedded_chunks],
+        documents=[chunk["text"] for chunk in embedded_chunks],
+        embeddings=[chunk["embedding"] for chunk in embedded_chunks],
+        metadatas=[{"chunk_index": chunk["chunk_id"]} for chunk in embedded_chunks]
+    )
+    return len(embedded_chunks)
+
+
+def _matches(value, condition) -> bool:
+    """
+    Check a shard-level metadata value against a Chroma filter condition.
+    """
+    if not isinstance(condition, dict):
+        return value == condition
+
+    for op, operand in condition.items():
+        if op not in COMPARISON_OPERATORS:
+            raise ValueError(f"Unsupported operator in where filter: {op}")
+        if op == "$eq" and value != operand:
+            return False
+        if op == "$ne" and value == operand:
+            return False
+        if op == "$in" and value not in operand:
+            return False
+        if op == "$nin" and value in operand:
+            return False
+        if op == "$gt" and not value > operand:
+            return False
+        if op == "$gte" and not value >= operand:
+            return False
+        if op == "$lt" and not value < operand:
+            return False
+        if op == "$lte" and not value <= operand:
+            return False
+    return True
+
+
+def _route(condition: dict, shard_metadata: dict) -> tuple[bool, dict | None]:
+    """
+    Evaluate one where clause against shard-level metadata.
+
+    Returns (clause can match, chunk-level remainder). A remainder of None
+    means the shard metadata alone satisfies the clause.
+    """
+    if len(condition) > 1:
+        # {"a": 1, "b": 2} is shorthand for an $and of both conditions
+        condition = {"$and": [{key: value} for key, value in condition.items()]}
+
+    key, value = next(iter(condition.items()))
+
+    if key == "$and":
+        remaining = []
+        for clause in value:
+            possible, remainder = _route(clause, shard_metadata)
+            if not possible:
+                return False, None
+            if remainder is not None:
+                remaining.append(remainder)
+        if not remaining:
+            return True, None
+        return True, remaining[0] if len(remaining) == 1 else {"$and": remaining}
+
+    if key == "$or":
+        remaining = []
+        for clause in value:
+            possible, remainder = _route(clause, shard_metadata)
+            if not possible:
+                continue
+            if remainder is None:
+                # One branch holds for every chunk in the shard
+                return True, None
+            remaining.append(remainder)
+        if not remaining:
+            return False, None
+        return True, remaining[0] if len(remaining) == 1 else {"$or": remaining}
+
+    if key.startswith("$"):
+        raise ValueError(f"Unsupported operator in where filter: {key}")
+
+    if key in shard_metadata:
+        return _matches(shard_metadata[key], value), None
+
+    # Chunk-level key: leave it for Chroma
+    return True, condition
+
+
+def route_where(shard: dict, where: dict | None) -> tuple[bool, dict | None]:
+    """
+    Decide whether a shard can satisfy a `where` filter.
+
+    Conditions on keys the shard fixes in its metadata are answered here,
+    through any nesting of $and / $or, and dropped; only the chunk-level
+    remainder is passed through to Chroma. Returns a tuple of
+    (shard is relevant, remaining where filter).
+    """
+    if not where:
+        return True, None
+
+    possible, remainder = _route(where, shard.get("metadata", {}))
+    if not possible:
+        return False, None
+    return True, remainder
+
+
+def distance_to_score(distance: float, space: str = "l2") -> float:
+    """
+    Convert a Chroma distance into a similarity so hits from shards with
+    different distance functions can be ranked together.
+
+    OpenAI embeddings are unit length, so every space maps onto cosine
+    similarity: squared L2 is 2 - 2*cos, cosine and ip distances are 1 - cos.
+    """
+    if space == "l2":
+        return 1 - distance / 2
+    return 1 - distance
+
+
+def minmax_normalize(hits: list[dict]) -> list[dict]:
+    """
+    Rescale the scores of one shard's hits into [0, 1].
+    """
+    if not hits:
+        return hits
+
+    scores = [hit["score"] for hit in hits]
+    low, high = min(scores), max(scores)
+    for hit in hits:
+        hit["score"] = 1.0 if high == low else (hit["score"] - low) / (high - low)
+    return hits
+
+
+def query_shard(shard: dict, query_embedding: list[float], top_k: int,
+                where: dict | None = None, client=None) -> list[dict]:
+    """
+    Query a single shard and return its hits as flat dicts. The collection is
+    looked up on every query, so a shard that was deleted and recreated is
+    picked up again; a missing one is skipped.
+    """
+    client = client or get_chroma_client()
+    try:
+        collection = client.get_collection(name=shard["name"])
+        results = collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            where=where,
+            include=["documents", "metadatas", "distances"]
+        )
+    except NotFoundError:
+        logger.warning("Shard %s has no collection in Chroma, skipping it", shard["name"])
+        return []
+
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+    hits = []
+    for chunk_id, document, metadata, distance in zip(
+        results["ids"][0], results["documents"][0],
+        results["metadatas"][0], results["distances"][0]
+    ):
+        hits.append({
+            "id": chunk_id,
+            "document": document,
+            "metadata": metadata,
+            "distance": distance,
+            "score": distance_to_score(distance, space),
+            "shard": shard["name"]
+        })
+    return hits
+
+
+def route_shards(shards: list[dict], where: dict | None) -> list[tuple[dict, dict | None]]:
+    """
+    Keep the shards a `where` filter can match, each paired with the
+    chunk-level filter still to be sent to Chroma.
+    """
+    routed = []
+    for shard in shards:
+        relevant, shard_where = route_where(shard, where)
+        if relevant:
+            routed.append((shard, shard_where))
+    return routed
+
+
+def query_shards(query_embeddings: dict[str, list[float]], top_k: int = 5,
+                 where: dict | None = None, shards: list[dict] | None = None,
+                 normalize: str = "space", parallel: bool | None = None,
+                 client=None) -> list[dict]:
+    """
+    Fan a query out to every relevant shard and merge the results.
+
+    `query_embeddings` maps an embedding model name to the query embedded with
+    that model, so shards built with different models can be searched at once.
+    `normalize` is "space" to compare converted similarities directly, or
+    "minmax" to rescale each shard's scores before merging. Shards are queried
+    concurrently when `parallel` is True; by default only for a remote client.
+    The same chunk text held by several shards is returned once, from the
+    shard where it scored best.
+    """
+    shards = SHARDS if shards is None else shards
+    client = client or get_chroma_client()
+
+    routed = route_shards(shards, where)
+    if not routed:
+        return []
+
+    def run(routed_shard):
+        shard, shard_where = routed_shard
+        model = shard.get("embedding_model", DEFAULT_EMBEDDING_MODEL)
+        hits = query_shard(shard, query_embeddings[model], top_k, shard_where, client)
+        return minmax_normalize(hits) if normalize == "minmax" else hits
+
+    if parallel is None:
+        parallel = is_remote(client)
+
+    if parallel and len(routed) > 1:
+        shard_hits = list(get_executor().map(run, routed))
+    else:
+        shard_hits = [run(routed_shard) for routed_shard in routed]
+
+    all_hits = sorted(
+        (hit for hits in shard_hits for hit in hits),
+        key=lambda hit: hit["score"], reverse=True
+    )
+
+    merged = []
+    seen = set()
+    for hit in all_hits:
+        if hit["document"] in seen:
+            continue
+        seen.add(hit["document"])
+        merged.append(hit)
+        if len(merged) == top_k:
+            break
+    return merged
+
+
+def search(query: str, top_k: int = 5, where: dict | None = None,
+           shards: list[dict] | None = None, normalize: str = "space") -> list[dict]:
+    """
+    Embed a query once per embedding model used by the shards the filter
+    routes to, and search across them.
+    """
+    shards = SHARDS if shards is None else shards
+    routed = [shard for shard, _ in route_shards(shards, where)]
+    if not routed:
+        return []
+
+    models = {shard.get("embedding_model", DEFAULT_EMBEDDING_MODEL) for shard in routed}
+    query_embeddings = {model: embed_query(query, model) for model in models}
+
+    return query_shards(query_embeddings, top_k, where, routed, normalize)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "load":
+        # Load the embedded_chunks* files into their own shards
+        for shard in SHARDS:
+            if "source_file" in shard:
+                stored = load_embedded_chunks(shard)
+                print(f"Stored {stored} chunks in {shard['name']}")
+    else:
+        query = " ".join(sys.argv[1:]) or "What advice do you have about resumes?"
+        for hit in search(query):
+            print(f"[{hit['score']:.3f}] {hit['shard']}: {hit['document'][:80]}...")
@@ -0,0 +1,137 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import chunker
+from chunker import count_tokens, create_token_chunks
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def unique_words(n: int) -> str:
+    # Distinct words so the overlap between chunks can be measured exactly
+    return ' '.join(f"word{i}" for i in range(n))
+
+
+def shared_words(first: str, second: str) -> list[str]:
+    """
+    Words at the end of `first` that `second` starts with.
+    """
+    first_words, second_words = first.split(), second.split()
+    for k in range(min(len(first_words), len(second_words)), 0, -1):
+        if first_words[-k:] == second_words[:k]:
+            return second_words[:k]
+    return []
+
+
+class StubEncoding:
+    """
+    Stands in for tiktoken: a word costs one token after a space but three
+    at the very start of the text, like many cl100k words without their
+    leading space.
+    """
+
+    def encode_ordinary(self, text: str) -> list[int]:
+        tokens = len(text.split())
+        if text and not text[0].isspace():
+            tokens += 2
+        return [0] * tokens
+
+
+@pytest.fixture
+def stub_encoding(monkeypatch):
+    encoding = StubEncoding()
+    monkeypatch.setattr(chunker, "_encoding", encoding)
+    monkeypatch.setattr(chunker, "_encoding_loaded", True)
+    monkeypatch.setattr(chunker, "_word_tokens", {})
+    monkeypatch.setattr(chunker, "_head_tokens", {})
+    chunker.split_transcript.cache_clear()
+    yield encoding
+    chunker.split_transcript.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def transcript():
+    path = sorted((REPO_ROOT / "processed").glob("*.json"))[0]
+    with open(path, 'r') as f:
+        return json.load(f)['transcript']
+
+
+def test_empty_input():
+    assert create_token_chunks("") == []
+    assert create_token_chunks("   \n ") == []
+
+
+def test_short_input_is_one_chunk():
+    assert create_token_chunks("hello there", 10, 2) == ["hello there"]
+
+
+@pytest.mark.parametrize("max_tokens,overlap_tokens", [(10, 0), (40, 8), (125, 25), (256, 32)])
+def test_chunks_stay_within_budget(transcript, max_tokens, overlap_tokens):
+    chunks = create_token_chunks(transcript, max_tokens, overlap_tokens)
+    assert chunks
+    assert all(count_tokens(chunk) <= max_tokens for chunk in chunks)
+
+
+@pytest.mark.parametrize("max_tokens,overlap_tokens", [(5, 0), (10, 4), (125, 25)])
+def test_budget_holds_against_tokenizer(stub_encoding, transcript, max_tokens, overlap_tokens):
+    # Count each whole chunk with the encoding directly, not via the
+    # chunker's cached per-word sums
+    chunks = create_token_chunks(transcript, max_tokens, overlap_tokens)
+    assert chunks
+    assert all(len(stub_encoding.encode_ordinary(chunk)) <= max_tokens for chunk in chunks)
+
+
+def test_chunks_never_cut_words(transcript):
+    words = set(transcript.split())
+    for chunk in create_token_chunks(transcript, 50, 10):
+        assert set(chunk.split()) <= words
+
+
+def test_chunks_cover_the_transcript(transcript):
+    chunks = create_token_chunks(transcript, 50, 10)
+    assert chunks[0].split()[0] == transcript.split()[0]
+    assert chunks[-1].split()[-1] == transcript.split()[-1]
+
+
+@pytest.mark.parametrize("overlap_tokens", [0, 5, 15])
+def test_overlap_is_bounded(overlap_tokens):
+    chunks = create_token_chunks(unique_words(300), 40, overlap_tokens)
+    assert len(chunks) > 1
+    for first, second in zip(chunks, chunks[1:]):
+        overlap = shared_words(first, second)
+        assert count_tokens(' '.join(overlap)) <= overlap_tokens
+        if overlap_tokens == 0:
+            assert overlap == []
+
+
+@pytest.mark.parametrize("max_tokens,overlap_tokens", [(0, 0), (10, 10), (3, 100), (10, -1)])
+def test_invalid_budget_is_rejected(max_tokens, overlap_tokens):
+    with pytest.raises(ValueError):
+        create_token_chunks(unique_words(7), max_tokens, overlap_tokens)
+
+
+def test_oversized_word_is_split_to_fit():
+    text = "start " + "x" * 5000 + " end"
+    chunks = create_token_chunks(text, 10, 2)
+    assert all(count_tokens(chunk) <= 10 for chunk in chunks)
+    assert ''.join(chunks[1:-1]) == "x" * 5000
+    assert chunks[0] == "start" and chunks[-1] == "end"
+
+
+def test_chunks_end_on_sentence_boundary():
+    sentence = "this sentence has exactly eight words in it."
+    text = ' '.join([sentence] * 10)
+    for chunk in create_token_chunks(text, 30, 0)[:-1]:
+        assert chunk.endswith('.')
+
+
+def test_overlap_snaps_to_sentence_start():
+    text = "one two three. four five six seven eight nine ten eleven twelve"
+    first, second = create_token_chunks(text, 10, 8)
+    # The sentence end is too early to end the first chunk on, but it falls
+    # in the overlap window, so the next chunk starts on the new sentence
+    # instead of on "three."
+    assert first == "one two three. four five six seven eight nine"
+    assert second == "four five six seven eight nine ten eleven twelve"
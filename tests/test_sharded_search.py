@@ -0,0 +1,186 @@
+import json
+import uuid
+from pathlib import Path
+
+import chromadb
+import pytest
+
+import sharded_search
+from sharded_search import DEFAULT_EMBEDDING_MODEL, load_embedded_chunks, query_shards, route_where
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SHARD = {"name": "shard", "metadata": {"channel": "bfe", "embedding_version": "v1", "year": 2024}}
+
+
+def test_route_where_without_filter():
+    assert route_where(SHARD, None) == (True, None)
+    assert route_where(SHARD, {}) == (True, None)
+
+
+def test_route_where_drops_satisfied_shard_keys():
+    assert route_where(SHARD, {"embedding_version": "v1"}) == (True, None)
+    assert route_where(SHARD, {"year": {"$gte": 2020}}) == (True, None)
+
+
+def test_route_where_prunes_mismatched_shard():
+    assert route_where(SHARD, {"embedding_version": "v2"}) == (False, None)
+    assert route_where(SHARD, {"year": {"$in": [2021, 2022]}}) == (False, None)
+
+
+def test_route_where_passes_chunk_keys_through():
+    where = {"$and": [{"embedding_version": "v1"}, {"chunk_index": {"$lt": 3}}]}
+    assert route_where(SHARD, where) == (True, {"chunk_index": {"$lt": 3}})
+
+    where = {"year": 2024, "chunk_index": 3, "title": "resumes"}
+    assert route_where(SHARD, where) == (True, {"$and": [{"chunk_index": 3}, {"title": "resumes"}]})
+
+
+def test_route_where_or_on_shard_keys():
+    where = {"$or": [{"embedding_version": "v1"}, {"embedding_version": "v2"}]}
+    assert route_where(SHARD, where) == (True, None)
+
+    where = {"$or": [{"embedding_version": "v2"}, {"embedding_version": "v3"}]}
+    assert route_where(SHARD, where) == (False, None)
+
+
+def test_route_where_or_keeps_only_live_branches():
+    where = {"$or": [
+        {"$and": [{"embedding_version": "v1"}, {"chunk_index": 1}]},
+        {"$and": [{"embedding_version": "v2"}, {"chunk_index": 2}]},
+        {"chunk_index": 3},
+    ]}
+    assert route_where(SHARD, where) == (True, {"$or": [{"chunk_index": 1}, {"chunk_index": 3}]})
+
+
+def test_route_where_nested_and_inside_or():
+    where = {"$or": [
+        {"$and": [{"embedding_version": "v2"}, {"year": 2024}]},
+        {"$and": [{"embedding_version": "v1"}, {"year": 2024}]},
+    ]}
+    assert route_where(SHARD, where) == (True, None)
+
+    where = {"$or": [
+        {"$and": [{"embedding_version": "v2"}, {"year": 2024}]},
+        {"$and": [{"embedding_version": "v1"}, {"year": 2023}]},
+    ]}
+    assert route_where(SHARD, where) == (False, None)
+
+
+@pytest.mark.parametrize("where", [
+    {"year": {"$gtt": 2020}},
+    {"year": {"$contains": 2020}},
+    {"$not": [{"year": 2020}]},
+])
+def test_route_where_rejects_unknown_operators(where):
+    with pytest.raises(ValueError):
+        route_where(SHARD, where)
+
+
+@pytest.fixture
+def overlapping_shards():
+    """
+    The three embedded_chunks files hold the same chunk texts; load each
+    into its own shard of a fresh in-memory client.
+    """
+    client = chromadb.EphemeralClient()
+    suffix = uuid.uuid4().hex[:8]
+    shards = [
+        {
+            "name": f"test_{version}_{suffix}",
+            "metadata": {"embedding_version": version},
+            "embedding_model": DEFAULT_EMBEDDING_MODEL,
+            "source_file": str(REPO_ROOT / source_file),
+        }
+        for version, source_file in [
+            ("v1", "embedded_chunks"),
+            ("v2", "embedded_chunks2"),
+            ("v3", "embedded_chunks3"),
+        ]
+    ]
+    for shard in shards:
+        load_embedded_chunks(shard, client)
+
+    yield client, shards
+
+    for shard in shards:
+        client.delete_collection(name=shard["name"])
+
+
+@pytest.mark.parametrize("normalize", ["space", "minmax"])
+@pytest.mark.parametrize("parallel", [False, True])
+def test_query_shards_deduplicates_across_shards(overlapping_shards, normalize, parallel):
+    client, shards = overlapping_shards
+    with open(REPO_ROOT / "embedded_chunks", 'r') as f:
+        query = json.load(f)[3]["embedding"]
+
+    hits = query_shards({DEFAULT_EMBEDDING_MODEL: query}, top_k=5, shards=shards,
+                        normalize=normalize, parallel=parallel, client=client)
+
+    documents = [hit["document"] for hit in hits]
+    assert len(hits) == 5
+    assert len(set(documents)) == 5
+    assert all(hit["shard"] in {shard["name"] for shard in shards} for hit in hits)
+
+
+def test_query_shards_routes_or_filter(overlapping_shards):
+    client, shards = overlapping_shards
+    with open(REPO_ROOT / "embedded_chunks", 'r') as f:
+        query = json.load(f)[3]["embedding"]
+
+    where = {"$or": [{"embedding_version": "v1"}, {"embedding_version": "v2"}]}
+    hits = query_shards({DEFAULT_EMBEDDING_MODEL: query}, top_k=5, where=where,
+                        shards=shards, client=client)
+
+    assert len(hits) == 5
+    assert {hit["shard"] for hit in hits} <= {shards[0]["name"], shards[1]["name"]}
+
+
+def test_query_shards_skips_missing_collection(overlapping_shards):
+    client, shards = overlapping_shards
+    missing = {"name": f"missing_{uuid.uuid4().hex[:8]}", "metadata": {}}
+    query = [0.0] * 1536
+
+    hits = query_shards({DEFAULT_EMBEDDING_MODEL: query}, top_k=3,
+                        shards=[missing, shards[0]], client=client)
+
+    assert len(hits) == 3
+    assert missing["name"] not in [c.name for c in client.list_collections()]
+
+
+def test_query_shards_after_collection_is_recreated(overlapping_shards):
+    client, shards = overlapping_shards
+    shard = shards[0]
+    query = [0.0] * 1536
+
+    assert len(query_shards({DEFAULT_EMBEDDING_MODEL: query}, top_k=3,
+                            shards=[shard], client=client)) == 3
+
+    # The reset step in chunking_test.py: delete the collection and start over
+    client.delete_collection(name=shard["name"])
+    load_embedded_chunks(shard, client)
+
+    assert len(query_shards({DEFAULT_EMBEDDING_MODEL: query}, top_k=3,
+                            shards=[shard], client=client)) == 3
+
+
+def test_search_embeds_only_for_routed_models(monkeypatch):
+    embedded = []
+
+    def fake_embed_query(query, model):
+        embedded.append(model)
+        return [0.0] * 1536
+
+    monkeypatch.setattr(sharded_search, "embed_query", fake_embed_query)
+    monkeypatch.setattr(sharded_search, "query_shards", lambda *args, **kwargs: [])
+
+    shards = [
+        {"name": "small", "metadata": {"embedding_version": "v1"}, "embedding_model": "small-model"},
+        {"name": "large", "metadata": {"embedding_version": "v2"}, "embedding_model": "large-model"},
+    ]
+    sharded_search.search("resumes", where={"embedding_version": "v2"}, shards=shards)
+    assert embedded == ["large-model"]
+
+    embedded.clear()
+    assert sharded_search.search("resumes", where={"embedding_version": "v3"}, shards=shards) == []
+    assert embedded == []